@@ -5,7 +5,6 @@ CRUD operations for virtual tag dimensions (mapping rules).
 Replaces the legacy bizmapping.py and mapping.py endpoints.
 """
 
-import hashlib
 import json
 import math
 from typing import Dict, List, Optional
@@ -15,7 +14,7 @@ from pydantic import BaseModel, Field
 
 from app.database import execute_query, execute_write
 from app.services.mapping_engine import mapping_engine
-from app.core.dsl_parser import validate_dimension_json
+from app.core.dsl_parser import serialize_dimension, validate_dimension_json
 from app.services.tag_discovery import tag_discovery_service
 
 router = APIRouter(prefix="/dimensions", tags=["dimensions"])
@@ -79,12 +78,6 @@ def _build_dimension_json(
     }
 
 
-def _compute_checksum(content: dict) -> str:
-    """MD5 hex digest of the canonical JSON representation."""
-    raw = json.dumps(content, sort_keys=True, separators=(",", ":"))
-    return hashlib.md5(raw.encode()).hexdigest()
-
-
 def _record_history(
     vtag_name: str,
     action: str,
@@ -187,8 +180,7 @@ async def create_dimension(payload: DimensionCreate):
     if errors:
         raise HTTPException(status_code=422, detail={"validation_errors": errors})
 
-    checksum = _compute_checksum(content)
-    content_json = json.dumps(content)
+    content_json, checksum = serialize_dimension(content)
 
     # Persist
     execute_write(
@@ -313,8 +305,7 @@ async def update_dimension(vtag_name: str, payload: DimensionUpdate):
     if errors:
         raise HTTPException(status_code=422, detail={"validation_errors": errors})
 
-    checksum = _compute_checksum(content)
-    content_json = json.dumps(content)
+    content_json, checksum = serialize_dimension(content)
 
     # Persist
     execute_write(
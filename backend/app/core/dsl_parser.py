@@ -5,15 +5,23 @@ Generic DSL parser for dimension mapping rules.
 Supports TAG['key'] and DIMENSION['key'] accessors with == and CONTAINS operators.
 """
 
+import hashlib
 import re
 from typing import Any, Dict, List, Optional, Set, Tuple
 
+import orjson
+
 
 # Regex patterns - compiled once at module level
 _TAG_PATTERN = re.compile(r"TAG\['([^']+)'\]\s*(==|CONTAINS)\s*'([^']*)'")
 _DIM_PATTERN = re.compile(r"(?:BUSINESS_)?DIMENSION\['([^']+)'\]\s*(==|CONTAINS)\s*'([^']*)'")
 _VALUE_PATTERN = re.compile(r"'([^']*)'")
 
+# Bound once for serialize_dimension, which runs per row during imports
+_blake2b = hashlib.blake2b
+_dumps = orjson.dumps
+_SORT_KEYS = orjson.OPT_SORT_KEYS
+
 
 def _parse_single_expr(expr: str) -> Optional[Dict]:
     """Parse a single comparison expression."""
@@ -112,6 +120,16 @@ def validate_dimension_json(content: Dict) -> List[str]:
     return errors
 
 
+def serialize_dimension(content: Dict) -> Tuple[str, str]:
+    """Serialize dimension content once for storage and change detection.
+
+    Returns (content_json, checksum): canonical (sorted-key) JSON and the
+    BLAKE2b-128 hex digest of those same bytes.
+    """
+    raw = _dumps(content, option=_SORT_KEYS)
+    return raw.decode(), _blake2b(raw, digest_size=16).hexdigest()
+
+
 def build_indexes(statements: List[Dict]) -> Dict:
     """Pre-parse all statements into fast-lookup indexes.
 
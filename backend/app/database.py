@@ -10,7 +10,7 @@ import sqlite3
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 from app.config import settings
 
@@ -23,12 +23,21 @@ def _get_db_path() -> str:
 
 
 @contextmanager
-def get_db():
-    """Context manager for database connections."""
+def get_db(bulk: bool = False):
+    """Context manager for database connections.
+
+    With bulk=True the connection also keeps temp tables in memory and
+    uses a 64 MiB page cache, for large batched writes (e.g. CLI imports).
+    These PRAGMAs are per-connection and end when it closes.
+    """
     conn = sqlite3.connect(_get_db_path())
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
     conn.execute("PRAGMA foreign_keys=ON")
+    if bulk:
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
     try:
         yield conn
         conn.commit()
@@ -39,6 +48,26 @@ def get_db():
         conn.close()
 
 
+@contextmanager
+def batch(bulk: bool = True):
+    """Context manager yielding a cursor inside one explicit write transaction.
+
+    The connection runs with isolation_level=None and the block is wrapped
+    in BEGIN IMMEDIATE ... COMMIT: the write lock is taken up front (no
+    SQLITE_BUSY when upgrading mid-batch) and the WAL sees a single commit.
+    Reusing the one cursor binds the same prepared statement for every row.
+    Rolls back if the block raises, like get_db().
+    """
+    with get_db(bulk=bulk) as conn:
+        conn.isolation_level = None
+        cur = conn.cursor()
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            yield cur
+        finally:
+            cur.close()
+
+
 def execute_query(query: str, params: tuple = ()) -> list[dict]:
     """Execute a SELECT query and return results as list of dicts."""
     with get_db() as conn:
@@ -48,6 +77,20 @@ def execute_query(query: str, params: tuple = ()) -> list[dict]:
         return [dict(zip(columns, row)) for row in rows]
 
 
+def execute_query_iter(query: str, params: tuple = ()) -> Iterator[dict]:
+    """Execute a SELECT query and yield rows as dicts one at a time.
+
+    Rows are pulled from the cursor lazily, so memory stays at one row
+    however large the result. The connection stays open until the generator
+    is exhausted or closed.
+    """
+    with get_db() as conn:
+        cursor = conn.execute(query, params)
+        columns = [description[0] for description in cursor.description]
+        for row in cursor:
+            yield dict(zip(columns, row))
+
+
 def execute_write(query: str, params: tuple = ()) -> int:
     """Execute an INSERT/UPDATE/DELETE query and return lastrowid or rowcount."""
     with get_db() as conn:
@@ -147,6 +190,13 @@ def _run_migrations(conn: sqlite3.Connection):
             conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_daily_stats_date ON daily_stats(stat_date)")
             print("  Migration: Added UNIQUE index on daily_stats.stat_date")
 
+    # Migration: Ensure UNIQUE dimensions.vtag_name (ON CONFLICT upserts in
+    # the dimensions import rely on it)
+    if _table_exists(conn, "dimensions"):
+        if not _has_unique_constraint(conn, "dimensions", "vtag_name"):
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_dimensions_vtag_name ON dimensions(vtag_name)")
+            print("  Migration: Added UNIQUE index on dimensions.vtag_name")
+
     # Migration: Add missing columns to tagging_jobs
     if _table_exists(conn, "tagging_jobs"):
         for col, col_type, default in [
@@ -164,6 +214,7 @@ def init_database():
     """Initialize the database with all required tables."""
     conn = sqlite3.connect(_get_db_path())
     conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
     conn.execute("PRAGMA foreign_keys=ON")
 
     try:
@@ -191,7 +242,7 @@ def init_database():
                 source TEXT DEFAULT 'TAGS',
                 content TEXT,
                 statement_count INTEGER DEFAULT 0,
-                checksum TEXT,
+                checksum TEXT,  -- opaque content hash (BLAKE2b-128 hex)
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP,
                 updated_at TEXT DEFAULT CURRENT_TIMESTAMP
             )
@@ -6,25 +6,52 @@ Replaces BPVtagger's hardcoded BizMapping chain with dynamic ordered dimensions.
 """
 
 import hashlib
-import json
+import os
+import pickle
+import stat
 import time
+from functools import lru_cache
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
+import orjson
+
+from app.config import settings
 from app.database import execute_query, execute_write
+from app.core import dsl_parser
 from app.core.dsl_parser import build_indexes, parse_value_expression, extract_tag_keys
 from app.services.agent_logger import log_timing
 
 
+@lru_cache(maxsize=None)
+def _code_fingerprint() -> str:
+    """Digest of the sources that shape pickled Dimensions.
+
+    Pickled indexes were built by the build_indexes of the code that wrote
+    them, so any change to dsl_parser or this module invalidates the cache.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for module_file in (dsl_parser.__file__, __file__):
+        with open(module_file, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
 class Dimension:
     """Single dimension with pre-parsed indexes."""
 
     def __init__(self, vtag_name: str, index: int, kind: str,
-                 default_value: str, statements: List[Dict]):
+                 default_value: str, statements: List[Dict],
+                 statement_count: Optional[int] = None):
         self.vtag_name = vtag_name
         self.index = index
         self.kind = kind
         self.default_value = default_value
         self.statements = statements
+        # Stored dimensions.statement_count when loaded from the DB
+        self.statement_count = (
+            statement_count if statement_count is not None else len(statements)
+        )
         self.indexes = build_indexes(statements)
 
     def match(self, tag_context: Dict[str, str],
@@ -83,6 +110,11 @@ class MappingEngine:
         self._sorted_dimensions: List[Dimension] = []
         self._loaded = False
         self._required_tag_keys: Set[str] = set()
+        # vtag_name -> (checksum, Dimension); lets reloads skip re-parsing
+        # and re-indexing rows whose content has not changed
+        self._parsed_cache: Dict[str, Tuple[str, Dimension]] = {}
+        # Table signature the current state was loaded from (see _table_signature)
+        self._loaded_signature: Optional[Tuple[Any, ...]] = None
 
     # Timing tracking
     _map_call_count = 0
@@ -94,8 +126,25 @@ class MappingEngine:
         cls._map_call_count = 0
         cls._timing_totals = {"load": 0, "tags": 0, "match": 0}
 
-    def load_dimensions(self):
-        """Load all dimensions from database, sorted by index_number."""
+    def load_dimensions(self, force: bool = False):
+        """Load all dimensions from database, sorted by index_number.
+
+        Returns immediately if the table is unchanged since the last load.
+        Otherwise rows whose checksum matches the previously parsed version
+        reuse the cached Dimension (no JSON parse or index build).
+        force=True drops the cache and re-parses everything.
+        """
+        if force:
+            self._parsed_cache.clear()
+
+        signature = self._table_signature()
+        if not force and self._loaded and signature == self._loaded_signature:
+            return
+
+        # Cold start (e.g. a CLI invocation): try the on-disk cache first
+        if not force and not self._parsed_cache and self._load_disk_cache(signature):
+            return
+
         self.dimensions.clear()
         self._sorted_dimensions.clear()
         self._required_tag_keys.clear()
@@ -104,18 +153,28 @@ class MappingEngine:
             "SELECT * FROM dimensions ORDER BY index_number"
         )
 
+        parsed_cache: Dict[str, Tuple[str, Dimension]] = {}
         for row in rows:
             try:
-                content = json.loads(row["content"]) if row["content"] else {}
-                statements = content.get("statements", []) if isinstance(content, dict) else []
-
-                dim = Dimension(
-                    vtag_name=row["vtag_name"],
-                    index=row["index_number"],
-                    kind=row["kind"],
-                    default_value=row["default_value"],
-                    statements=statements
-                )
+                checksum = row.get("checksum")
+                cached = self._parsed_cache.get(row["vtag_name"])
+                if checksum and cached and cached[0] == checksum:
+                    dim = cached[1]
+                else:
+                    content = orjson.loads(row["content"]) if row["content"] else {}
+                    statements = content.get("statements", []) if isinstance(content, dict) else []
+
+                    dim = Dimension(
+                        vtag_name=row["vtag_name"],
+                        index=row["index_number"],
+                        kind=row["kind"],
+                        default_value=row["default_value"],
+                        statements=statements,
+                        statement_count=row.get("statement_count"),
+                    )
+                if checksum:
+                    parsed_cache[dim.vtag_name] = (checksum, dim)
+
                 self.dimensions[dim.vtag_name] = dim
                 self._sorted_dimensions.append(dim)
 
@@ -126,9 +185,105 @@ class MappingEngine:
             except Exception as e:
                 print(f"Error loading dimension {row.get('vtag_name', '?')}: {e}")
 
+        self._parsed_cache = parsed_cache
         self._loaded = True
+        self._loaded_signature = signature
+        self._write_disk_cache(signature)
         print(f"[INFO] Loaded {len(self.dimensions)} dimensions, {len(self._required_tag_keys)} tag keys")
 
+    # ------------------------------------------------------------------
+    # On-disk parsed-dimension cache
+    #
+    # A pure read cache shared across processes: it is keyed by the
+    # dimensions table signature, so any insert, update or delete through
+    # the normal paths invalidates it implicitly.
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _disk_cache_path() -> Path:
+        """Location of the pickled dimension cache.
+
+        Unpickling runs arbitrary code, so this trusts output_dir to be
+        writable only by the vtagger user. The cache is written owner-only
+        (0600), and _load_disk_cache ignores a file owned by another user
+        or writable by group/others.
+        """
+        return Path(settings.output_dir) / ".dim_cache.pkl"
+
+    @staticmethod
+    def _table_signature() -> Tuple[Any, ...]:
+        """Cheap probe identifying the current contents of the dimensions table.
+
+        (MAX(updated_at), COUNT(*), digest of all name:checksum pairs). The
+        digest catches edits within the same second, which updated_at's
+        one-second resolution would miss.
+        """
+        row = execute_query(
+            "SELECT MAX(updated_at) AS max_updated, COUNT(*) AS n, "
+            "group_concat(vtag_name || ':' || IFNULL(checksum, ''), ',') AS checksums "
+            "FROM (SELECT vtag_name, checksum, updated_at FROM dimensions ORDER BY vtag_name)"
+        )[0]
+        digest = hashlib.blake2b(
+            (row["checksums"] or "").encode(), digest_size=16
+        ).hexdigest()
+        return (row["max_updated"], row["n"], digest)
+
+    def _load_disk_cache(self, signature: Tuple[Any, ...]) -> bool:
+        """Populate the engine from the disk cache if its signature matches."""
+        try:
+            with open(self._disk_cache_path(), "rb") as f:
+                st = os.fstat(f.fileno())
+                if hasattr(os, "getuid") and (
+                    st.st_uid != os.getuid()
+                    or st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+                ):
+                    return False
+                payload = pickle.load(f)
+            if payload.get("version") != _code_fingerprint() or payload.get("meta") != signature:
+                return False
+            entries: List[Tuple[Optional[str], Dimension]] = payload["dims"]
+        except Exception:
+            return False
+
+        self.dimensions.clear()
+        self._sorted_dimensions.clear()
+        self._required_tag_keys.clear()
+        self._parsed_cache = {}
+
+        for checksum, dim in entries:
+            self.dimensions[dim.vtag_name] = dim
+            self._sorted_dimensions.append(dim)
+            self._required_tag_keys.update(dim.indexes["tag_keys_used"])
+            if checksum:
+                self._parsed_cache[dim.vtag_name] = (checksum, dim)
+
+        self._loaded = True
+        self._loaded_signature = signature
+        print(f"[INFO] Loaded {len(self.dimensions)} dimensions, {len(self._required_tag_keys)} tag keys (cached)")
+        return True
+
+    def _write_disk_cache(self, signature: Tuple[Any, ...]):
+        """Atomically rewrite the disk cache; failures are non-fatal."""
+        checksums = {name: cs for name, (cs, _) in self._parsed_cache.items()}
+        payload = {
+            "version": _code_fingerprint(),
+            "meta": signature,
+            "dims": [(checksums.get(d.vtag_name), d) for d in self._sorted_dimensions],
+        }
+        path = self._disk_cache_path()
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
     def get_required_tag_keys(self) -> Set[str]:
         """Return set of tag keys needed from Umbrella API."""
         if not self._loaded:
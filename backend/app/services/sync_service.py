@@ -675,25 +675,14 @@ class SyncService:
                 f"{payer_id} ({len(records)} records)"
             )
 
-            csv_path = None
             gz_path = None
             try:
-                # Write CSV for this payer
-                csv_path = os.path.join(
+                # Write gzipped CSV for this payer (compressed while writing)
+                gz_path = os.path.join(
                     output_dir,
-                    f"upload_{payer_id}_{len(records)}.csv",
+                    f"upload_{payer_id}_{len(records)}.csv.gz",
                 )
-                self._write_upload_csv(records, csv_path)
-
-                # Compress
-                gz_path = csv_path + ".gz"
-                with open(csv_path, "rb") as f_in:
-                    with gzip.open(gz_path, "wb") as f_out:
-                        while True:
-                            chunk = f_in.read(1024 * 1024)
-                            if not chunk:
-                                break
-                            f_out.write(chunk)
+                self._write_upload_csv(records, gz_path)
 
                 # Upload via presigned URL
                 upload_id = umbrella_client.upload_virtual_tags(
@@ -714,13 +703,12 @@ class SyncService:
                 log_timing(f"[SYNC] Error uploading payer {payer_id}: {e}")
 
             finally:
-                # Cleanup temp files
-                for path in [csv_path, gz_path]:
-                    if path:
-                        try:
-                            os.unlink(path)
-                        except OSError:
-                            pass
+                # Cleanup temp file
+                if gz_path:
+                    try:
+                        os.unlink(gz_path)
+                    except OSError:
+                        pass
 
         log_timing(
             f"[SYNC] Upload complete: "
@@ -806,11 +794,9 @@ class SyncService:
 
                 # Build vtag string from dimensions (dynamic, not hardcoded)
                 dims = record.get("dimensions", {})
-                vtags = []
-                for dim_name, dim_value in dims.items():
-                    if dim_value and dim_value != "Unallocated":
-                        vtags.append(f"{dim_name}:{dim_value}")
-
+                vtags = ";".join(
+                    f"{k}:{v}" for k, v in dims.items() if v and v != "Unallocated"
+                )
                 if not vtags:
                     continue
 
@@ -820,7 +806,7 @@ class SyncService:
                 groups[payer_account].append({
                     "resource_id": resource_id,
                     "linked_account": record.get("linkedaccid", ""),
-                    "vtags": ";".join(vtags),
+                    "vtags": vtags,
                 })
 
         return groups
@@ -833,9 +819,14 @@ class SyncService:
                 Linked Account,Virtual Tags,Tags
 
         Uses manual writes (not csv.writer) to match BPVtagger's format
-        with Unix line endings.
+        with Unix line endings. Paths ending in ``.gz`` are gzip-compressed
+        on the fly (level 1: CSV compresses well even at the fastest level).
         """
-        with open(csv_path, "w", encoding="utf-8") as f:
+        if csv_path.endswith(".gz"):
+            f = gzip.open(csv_path, "wt", encoding="utf-8", compresslevel=1)
+        else:
+            f = open(csv_path, "w", encoding="utf-8")
+        with f:
             f.write("Resource Cost,Resource Name,Resource ID,Service,Region,Linked Account,Virtual Tags,Tags\n")
 
             for record in records:
@@ -7,7 +7,7 @@ Discovers and caches physical tag keys from Umbrella assets.
 import json
 from typing import Dict, List
 
-from app.database import execute_query, execute_write
+from app.database import execute_query, execute_write, get_db
 
 
 class TagDiscoveryService:
@@ -37,17 +37,24 @@ class TagDiscoveryService:
                         tag_data[tag_name] = set()
                     tag_data[tag_name].add(col_value)
 
-        # Update database
-        for tag_key, values in tag_data.items():
-            sample_values = list(values)[:10]
+        if not tag_data:
+            return
 
-            existing = execute_query(
-                "SELECT id, sample_values, occurrence_count FROM discovered_tags WHERE tag_key = ?",
-                (tag_key,)
+        # Load existing rows in one query instead of a SELECT per tag key
+        existing = {
+            row["tag_key"]: row
+            for row in execute_query(
+                "SELECT tag_key, sample_values, occurrence_count FROM discovered_tags"
             )
+        }
+
+        to_update = []
+        to_insert = []
+        for tag_key, values in tag_data.items():
+            sample_values = list(values)[:10]
 
-            if existing:
-                row = existing[0]
+            row = existing.get(tag_key)
+            if row:
                 try:
                     existing_samples = json.loads(row["sample_values"] or "[]")
                 except (json.JSONDecodeError, TypeError):
@@ -56,18 +63,22 @@ class TagDiscoveryService:
                 # Merge samples (keep up to 10)
                 merged = list(set(existing_samples + sample_values))[:10]
                 new_count = (row["occurrence_count"] or 0) + len(values)
-
-                execute_write(
-                    "UPDATE discovered_tags SET sample_values = ?, last_seen_at = CURRENT_TIMESTAMP, "
-                    "occurrence_count = ? WHERE tag_key = ?",
-                    (json.dumps(merged), new_count, tag_key)
-                )
+                to_update.append((json.dumps(merged), new_count, tag_key))
             else:
-                execute_write(
-                    "INSERT INTO discovered_tags (tag_key, sample_values, occurrence_count) "
-                    "VALUES (?, ?, ?)",
-                    (tag_key, json.dumps(sample_values), len(values))
-                )
+                to_insert.append((tag_key, json.dumps(sample_values), len(values)))
+
+        # Update database
+        with get_db() as conn:
+            conn.executemany(
+                "UPDATE discovered_tags SET sample_values = ?, last_seen_at = CURRENT_TIMESTAMP, "
+                "occurrence_count = ? WHERE tag_key = ?",
+                to_update,
+            )
+            conn.executemany(
+                "INSERT INTO discovered_tags (tag_key, sample_values, occurrence_count) "
+                "VALUES (?, ?, ?)",
+                to_insert,
+            )
 
     def get_discovered_tags(self) -> List[Dict]:
         """Return all discovered tag keys with sample values."""
@@ -16,6 +16,7 @@ import json
 import os
 import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, Generator, List, Optional, Set, Tuple
 from urllib.parse import urlencode
@@ -29,6 +30,13 @@ from app.services.agent_logger import log_timing
 
 TOKENIZER_URL = "https://tokenizer.umbrellacost.io/prod/credentials"
 
+# monitor_import poll interval bounds (seconds)
+MONITOR_POLL_MIN_DELAY = 0.5
+MONITOR_POLL_MAX_DELAY = 15.0
+# Floor for the delay after progress advances (the old fixed interval), so a
+# steadily progressing import is never polled faster than before
+MONITOR_POLL_RESET_DELAY = 5.0
+
 
 class UmbrellaClient:
     """Client for the Umbrella Cost Management API with dual auth support.
@@ -45,6 +53,10 @@ class UmbrellaClient:
         self.temp_apikey: Optional[str] = None  # Raw temp apikey from auth
         self.token_expiry: Optional[datetime] = None
         self.auth_method: Optional[str] = None  # "cognito" or "um2"
+        # get_accounts() cache (account list rarely changes within a process)
+        self._accounts_cache: Optional[Tuple[List[Dict], List[Dict]]] = None
+        self._accounts_cache_ts: Optional[datetime] = None
+        self._account_id_to_key: Dict[str, str] = {}
 
     # ------------------------------------------------------------------
     # Authentication (dual: Cognito + UM 2.0 fallback)
@@ -175,16 +187,27 @@ class UmbrellaClient:
     # Accounts
     # ------------------------------------------------------------------
 
-    def get_accounts(self) -> Tuple[List[Dict], List[Dict]]:
+    ACCOUNTS_CACHE_TTL = timedelta(minutes=5)
+
+    def get_accounts(self, force: bool = False) -> Tuple[List[Dict], List[Dict]]:
         """
         Fetch the list of cloud accounts from Umbrella.
 
         Tries /v1/users/plain-sub-users first (Cognito-compatible),
         then falls back to /v1/user-management/accounts (UM 2.0).
+        Results are cached for ACCOUNTS_CACHE_TTL unless force=True.
 
         Returns:
             Tuple of (aggregate_accounts, individual_accounts).
         """
+        if (
+            not force
+            and self._accounts_cache is not None
+            and self._accounts_cache_ts is not None
+            and datetime.now() < self._accounts_cache_ts + self.ACCOUNTS_CACHE_TTL
+        ):
+            return self._accounts_cache
+
         self._ensure_authenticated()
 
         # Try plain-sub-users first, fall back to user-management
@@ -208,6 +231,21 @@ class UmbrellaClient:
             f"ACCOUNTS: {len(aggregate_accounts)} aggregate, "
             f"{len(individual_accounts)} individual"
         )
+
+        # Index accountId/accountName -> accountKey (first match wins,
+        # individual accounts take precedence over aggregates)
+        account_id_to_key: Dict[str, str] = {}
+        for acc in individual_accounts + aggregate_accounts:
+            acc_key = acc.get("accountKey")
+            if not acc_key:
+                continue
+            for ident in (acc.get("accountId"), acc.get("accountName")):
+                if ident and ident not in account_id_to_key:
+                    account_id_to_key[ident] = acc_key
+
+        self._accounts_cache = (aggregate_accounts, individual_accounts)
+        self._accounts_cache_ts = datetime.now()
+        self._account_id_to_key = account_id_to_key
         return aggregate_accounts, individual_accounts
 
     def _get_accounts_plain_sub_users(self) -> Optional[List[Dict]]:
@@ -350,86 +388,105 @@ class UmbrellaClient:
         params.append(("costType", "cost"))
         params.append(("isUnblended", "false"))
 
-        next_token = None
         batch = []
         page_count = 0
         total_records = 0
 
-        with httpx.Client(timeout=600.0) as client:
-            while True:
-                page_count += 1
+        def fetch_page(page_number: int, token: Optional[str]) -> Dict:
+            """Fetch and decode a single page (runs on the prefetch thread)."""
+            nonlocal headers
 
-                request_params = list(params)
-                if next_token:
-                    request_params.append(("token", next_token))
+            request_params = list(params)
+            if token:
+                request_params.append(("token", token))
 
-                query_string = urlencode(request_params)
+            query_string = urlencode(request_params)
 
-                # Add governance tags filter for not_vtagged mode
-                if filter_mode == "not_vtagged" and vtag_filter_dimensions:
-                    for dim in vtag_filter_dimensions:
-                        query_string += f"&filters%5Bgovernance_tags_keys%5D={dim}%3A%20no_tag"
-                # filter_mode == "all" -> no governance filter
+            # Add governance tags filter for not_vtagged mode
+            if filter_mode == "not_vtagged" and vtag_filter_dimensions:
+                for dim in vtag_filter_dimensions:
+                    query_string += f"&filters%5Bgovernance_tags_keys%5D={dim}%3A%20no_tag"
+            # filter_mode == "all" -> no governance filter
 
-                full_url = f"{url}?{query_string}"
+            full_url = f"{url}?{query_string}"
 
-                try:
-                    log_timing(f"FETCH: Page {page_count} for account {account_key}")
-                    response = client.get(full_url, headers=headers)
+            try:
+                log_timing(f"FETCH: Page {page_number} for account {account_key}")
+                response = client.get(full_url, headers=headers)
 
-                    # Handle token expiration
-                    if response.status_code == 401:
-                        log_timing("FETCH: Token expired, re-authenticating...")
-                        self.jwt_token = None
-                        self._ensure_authenticated()
-                        headers = self._build_headers(account_key)
-                        response = client.get(full_url, headers=headers)
-
-                    if response.status_code != 200:
-                        raise Exception(
-                            f"Failed to fetch assets: {response.status_code}"
-                        )
+                # Handle token expiration
+                if response.status_code == 401:
+                    log_timing("FETCH: Token expired, re-authenticating...")
+                    self.jwt_token = None
+                    self._ensure_authenticated()
+                    headers = self._build_headers(account_key)
+                    response = client.get(full_url, headers=headers)
 
-                except httpx.RequestError as exc:
-                    log_timing(f"FETCH: Page {page_count} failed - {exc}")
-                    raise
+                if response.status_code != 200:
+                    raise Exception(
+                        f"Failed to fetch assets: {response.status_code}"
+                    )
 
-                result = response.json()
-                data = result.get("data", [])
-                total_records += len(data)
+            except httpx.RequestError as exc:
+                log_timing(f"FETCH: Page {page_number} failed - {exc}")
+                raise
 
-                log_timing(
-                    f"FETCH: Page {page_count} returned {len(data)} rows "
-                    f"(total: {total_records})"
-                )
+            return response.json()
 
-                if progress_callback:
-                    progress_callback(page_count, total_records)
+        # Pages are chained by nextToken, so they can't be fetched in
+        # parallel, but the next page can be requested while the caller is
+        # still consuming batches from the current one. If the consumer
+        # stops early (generator closed), the prefetcher is shut down
+        # without waiting on the in-flight page.
+        prefetcher = ThreadPoolExecutor(max_workers=1)
+        with httpx.Client(timeout=600.0) as client:
+            try:
+                pending = prefetcher.submit(fetch_page, 1, None)
 
-                for asset in data:
-                    batch.append(asset)
-                    if len(batch) >= batch_size:
-                        yield batch
-                        batch = []
+                while True:
+                    page_count += 1
+                    result = pending.result()
+                    data = result.get("data", [])
+                    total_records += len(data)
 
-                next_token = result.get("nextToken")
-                if not next_token:
                     log_timing(
-                        f"FETCH: Complete - {total_records} records "
-                        f"in {page_count} pages"
+                        f"FETCH: Page {page_count} returned {len(data)} rows "
+                        f"(total: {total_records})"
                     )
-                    break
 
-                if max_pages > 0 and page_count >= max_pages:
-                    log_timing(
-                        f"FETCH: Reached max_pages limit ({max_pages}), "
-                        f"total: {total_records} records"
-                    )
-                    break
+                    next_token = result.get("nextToken")
+                    reached_max = max_pages > 0 and page_count >= max_pages
+                    if next_token and not reached_max:
+                        pending = prefetcher.submit(fetch_page, page_count + 1, next_token)
+
+                    if progress_callback:
+                        progress_callback(page_count, total_records)
 
-            # Yield remaining
-            if batch:
-                yield batch
+                    for asset in data:
+                        batch.append(asset)
+                        if len(batch) >= batch_size:
+                            yield batch
+                            batch = []
+
+                    if not next_token:
+                        log_timing(
+                            f"FETCH: Complete - {total_records} records "
+                            f"in {page_count} pages"
+                        )
+                        break
+
+                    if reached_max:
+                        log_timing(
+                            f"FETCH: Reached max_pages limit ({max_pages}), "
+                            f"total: {total_records} records"
+                        )
+                        break
+
+                # Yield remaining
+                if batch:
+                    yield batch
+            finally:
+                prefetcher.shutdown(wait=False, cancel_futures=True)
 
     # ------------------------------------------------------------------
     # Virtual Tag Upload (presigned URL flow)
@@ -470,11 +527,8 @@ class UmbrellaClient:
         if not account_key:
             if not account_id:
                 raise Exception("Either account_id or account_key must be provided")
-            aggregate_accounts, individual_accounts = self.get_accounts()
-            for acc in individual_accounts + aggregate_accounts:
-                if acc.get("accountId") == account_id or acc.get("accountName") == account_id:
-                    account_key = acc.get("accountKey")
-                    break
+            self.get_accounts()
+            account_key = self._account_id_to_key.get(account_id)
             if not account_key:
                 raise Exception(f"Account not found: {account_id}")
 
@@ -517,17 +571,19 @@ class UmbrellaClient:
                 f"(mode={mode})"
             )
 
-            # Step 2: Upload the file
-            with open(csv_path, "rb") as f:
-                file_data = f.read()
-
-            upload_headers = {"Content-Type": "text/csv"}
+            # Step 2: Upload the file, streamed from disk. An explicit
+            # Content-Length keeps the presigned PUT from going chunked.
+            upload_headers = {
+                "Content-Type": "text/csv",
+                "Content-Length": str(os.path.getsize(csv_path)),
+            }
             if compressed:
                 upload_headers["Content-Encoding"] = "gzip"
 
-            upload_response = client.put(
-                upload_url, content=file_data, headers=upload_headers
-            )
+            with open(csv_path, "rb") as f:
+                upload_response = client.put(
+                    upload_url, content=f, headers=upload_headers
+                )
 
             if upload_response.status_code not in (200, 201, 204):
                 raise Exception(
@@ -563,6 +619,12 @@ class UmbrellaClient:
             f"/v1/governance-tags/resources/import/status/{upload_id}"
         )
 
+        # Adaptive polling: start fast, back off geometrically while the
+        # reported progress is flat, and halve the delay (down to
+        # MONITOR_POLL_RESET_DELAY) when it advances.
+        delay = MONITOR_POLL_MIN_DELAY
+        last_progress = None
+
         with httpx.Client(timeout=30.0) as client:
             while True:
                 response = client.get(url, headers=headers)
@@ -579,7 +641,22 @@ class UmbrellaClient:
                 if state in ("COMPLETED", "FAILED", "CANCELLED"):
                     break
 
-                time.sleep(5)
+                progress = status.get("progress")
+                if progress is not None and progress != last_progress:
+                    if last_progress is not None:
+                        delay = max(delay / 2, MONITOR_POLL_RESET_DELAY)
+                    last_progress = progress
+
+                sleep_for = delay
+                retry_after = response.headers.get("Retry-After")
+                if retry_after:
+                    try:
+                        sleep_for = max(sleep_for, float(retry_after))
+                    except ValueError:
+                        pass
+
+                time.sleep(sleep_for)
+                delay = min(delay * 1.5, MONITOR_POLL_MAX_DELAY)
 
     # ------------------------------------------------------------------
     # Date Utilities
@@ -9,20 +9,84 @@ Ported from BPVtagger with dynamic vtag columns from dimensions dict.
 """
 
 import csv
+import gzip
 import io
 import json
 import os
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import orjson
 
 from app.config import settings
 from app.database import execute_query, execute_write, get_db
 from app.services.agent_logger import log_timing
 
 
+_UNALLOCATED = "Unallocated"
+
+# Max concurrent per-payer uploads in upload_from_jsonl(group_by_payer=True)
+UPLOAD_MAX_WORKERS = 8
+
+# Max per-payer CSVs held open at once by group_jsonl_by_payer_account;
+# the least recently written one is closed and later reopened for append
+GROUP_MAX_OPEN_FILES = 64
+
+
+_CSV_HEADER = "resourceid,linkedaccid,payeraccount,vtags\r\n"
+
+
+def _open_csv(path: str, mode: str, buffering: int = 1 << 20):
+    """Open a CSV file for text I/O, transparently (de)compressing ``.gz`` paths."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", newline="", compresslevel=1)
+    return open(path, mode, newline="", buffering=buffering)
+
+
+def _q(value: Any) -> str:
+    """Quote a CSV field only when needed (same rules as csv.QUOTE_MINIMAL)."""
+    value = "" if value is None else str(value)
+    if "," in value or '"' in value or "\n" in value or "\r" in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _iter_jsonl(jsonl_file: str) -> Iterator[Dict[str, Any]]:
+    """Yield parsed records from a JSONL file, skipping blank/invalid lines."""
+    loads = orjson.loads
+    with open(jsonl_file, "rb") as f:
+        for line in f:
+            if line.isspace():
+                continue
+            try:
+                yield loads(line)
+            except orjson.JSONDecodeError:
+                continue
+
+
+def _csv_row(record: Dict[str, Any]) -> str:
+    """Render one JSONL record as an upload CSV row.
+
+    Fixed 4-column schema written directly; only the free-text columns go
+    through _q (account IDs are numeric). Vtags are "dim:value" pairs joined
+    with "|", skipping empty and Unallocated values.
+    """
+    dims = record.get("dimensions", {})
+    vtag_str = "|".join(
+        f"{k}:{v}" for k, v in dims.items() if v and v != _UNALLOCATED
+    )
+    return (
+        f"{_q(record.get('resourceid', ''))},"
+        f"{record.get('linkedaccid') or ''},"
+        f"{record.get('payeraccount') or ''},"
+        f"{_q(vtag_str)}\r\n"
+    )
+
+
 class VtagUploadService:
     """Handles conversion and upload of vtag data."""
 
@@ -41,6 +105,7 @@ class VtagUploadService:
         self,
         jsonl_file: str,
         csv_file: Optional[str] = None,
+        compressed: bool = False,
     ) -> str:
         """
         Convert a JSONL tagged output file to CSV format for upload.
@@ -52,63 +117,49 @@ class VtagUploadService:
         Args:
             jsonl_file: Path to input JSONL file.
             csv_file: Optional output CSV path. Defaults to same name with .csv extension.
+            compressed: If True, gzip the CSV while writing it (.csv.gz), so no
+                plaintext intermediate is produced.
 
         Returns:
             Path to the generated CSV file.
         """
+        return self._convert_jsonl_to_csv(jsonl_file, csv_file, compressed)[0]
+
+    def _convert_jsonl_to_csv(
+        self,
+        jsonl_file: str,
+        csv_file: Optional[str] = None,
+        compressed: bool = False,
+    ) -> Tuple[str, int]:
+        """convert_jsonl_to_csv, also returning the number of rows written."""
         if csv_file is None:
             csv_file = jsonl_file.rsplit(".", 1)[0] + "_upload.csv"
+            if compressed:
+                csv_file += ".gz"
 
         log_timing(f"Converting JSONL to CSV: {jsonl_file}")
 
-        # First pass: discover all dimension names and collect records
-        all_dim_names = set()
-        records = []
-
-        with open(jsonl_file, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    record = json.loads(line)
-                    records.append(record)
-                    dims = record.get("dimensions", {})
-                    all_dim_names.update(dims.keys())
-                except json.JSONDecodeError:
-                    continue
-
-        sorted_dim_names = sorted(all_dim_names)
-
-        # Write CSV with dynamic vtag columns
-        with open(csv_file, "w", newline="") as f:
-            writer = csv.writer(f)
+        # Single streaming pass: each record is written as soon as it is
+        # parsed, so memory stays flat regardless of file size.
+        count = 0
+        with _open_csv(csv_file, "w") as f:
+            write = f.write
 
             # Header: resourceid, linkedaccid, payeraccount, vtags
-            writer.writerow(["resourceid", "linkedaccid", "payeraccount", "vtags"])
-
-            for record in records:
-                resource_id = record.get("resourceid", "")
-                linked_acc = record.get("linkedaccid", "")
-                payer_acc = record.get("payeraccount", "")
+            write(_CSV_HEADER)
 
-                dims = record.get("dimensions", {})
-                vtags = []
-                for dim_name, dim_value in dims.items():
-                    if dim_value and dim_value != "Unallocated":
-                        vtags.append(f"{dim_name}:{dim_value}")
+            for record in _iter_jsonl(jsonl_file):
+                write(_csv_row(record))
+                count += 1
 
-                vtag_str = "|".join(vtags) if vtags else ""
-
-                writer.writerow([resource_id, linked_acc, payer_acc, vtag_str])
-
-        log_timing(f"CSV generated: {csv_file} ({len(records)} records)")
-        return csv_file
+        log_timing(f"CSV generated: {csv_file} ({count} records)")
+        return csv_file, count
 
     def group_jsonl_by_payer_account(
         self,
         jsonl_file: str,
         output_dir: Optional[str] = None,
+        compressed: bool = False,
     ) -> Dict[str, str]:
         """
         Group JSONL records by payer account and write separate CSV files.
@@ -118,61 +169,67 @@ class VtagUploadService:
         Args:
             jsonl_file: Path to input JSONL file.
             output_dir: Directory for output CSVs. Defaults to same directory as input.
+            compressed: If True, write each CSV gzip-compressed (.csv.gz).
 
         Returns:
             Dict mapping payer_account -> csv_file_path.
         """
+        return self._group_jsonl_by_payer_account(jsonl_file, output_dir, compressed)[0]
+
+    def _group_jsonl_by_payer_account(
+        self,
+        jsonl_file: str,
+        output_dir: Optional[str] = None,
+        compressed: bool = False,
+    ) -> Tuple[Dict[str, str], Dict[str, int]]:
+        """group_jsonl_by_payer_account, also returning per-payer row counts."""
         if output_dir is None:
             output_dir = os.path.dirname(jsonl_file)
 
         log_timing(f"Grouping JSONL by payer account: {jsonl_file}")
 
-        # Group records by payer account
-        groups: Dict[str, List[Dict]] = defaultdict(list)
-
-        with open(jsonl_file, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    record = json.loads(line)
-                    payer = record.get("payeraccount", "unknown")
-                    groups[payer].append(record)
-                except json.JSONDecodeError:
-                    continue
-
-        # Write a CSV per payer account
-        output_files = {}
+        # Stream records into one CSV per payer account. At most
+        # GROUP_MAX_OPEN_FILES stay open (LRU), each with a default-sized
+        # buffer, so memory and file descriptors stay bounded for MSPs with
+        # hundreds of payers. A reopened .gz file gains another gzip member,
+        # which gzip readers treat as one continuous stream.
+        output_files: Dict[str, str] = {}
+        writers: "OrderedDict[str, Any]" = OrderedDict()
+        counts: Dict[str, int] = defaultdict(int)
         base_name = os.path.splitext(os.path.basename(jsonl_file))[0]
 
-        for payer, records in groups.items():
-            safe_payer = payer.replace("/", "_").replace("\\", "_")
-            csv_path = os.path.join(output_dir, f"{base_name}_{safe_payer}.csv")
-
-            with open(csv_path, "w", newline="") as f:
-                writer = csv.writer(f)
-                writer.writerow(["resourceid", "linkedaccid", "payeraccount", "vtags"])
-
-                for record in records:
-                    resource_id = record.get("resourceid", "")
-                    linked_acc = record.get("linkedaccid", "")
-                    payer_acc = record.get("payeraccount", "")
-
-                    dims = record.get("dimensions", {})
-                    vtags = []
-                    for dim_name, dim_value in dims.items():
-                        if dim_value and dim_value != "Unallocated":
-                            vtags.append(f"{dim_name}:{dim_value}")
-
-                    vtag_str = "|".join(vtags) if vtags else ""
-                    writer.writerow([resource_id, linked_acc, payer_acc, vtag_str])
-
-            output_files[payer] = csv_path
-            log_timing(f"  Payer {payer}: {len(records)} records -> {csv_path}")
+        try:
+            for record in _iter_jsonl(jsonl_file):
+                payer = record.get("payeraccount", "unknown")
+                f = writers.get(payer)
+                if f is None:
+                    if len(writers) >= GROUP_MAX_OPEN_FILES:
+                        writers.popitem(last=False)[1].close()
+                    csv_path = output_files.get(payer)
+                    if csv_path is None:
+                        safe_payer = payer.replace("/", "_").replace("\\", "_")
+                        csv_path = os.path.join(output_dir, f"{base_name}_{safe_payer}.csv")
+                        if compressed:
+                            csv_path += ".gz"
+                        f = writers[payer] = _open_csv(csv_path, "w", buffering=-1)
+                        f.write(_CSV_HEADER)
+                        output_files[payer] = csv_path
+                    else:
+                        f = writers[payer] = _open_csv(csv_path, "a", buffering=-1)
+                else:
+                    writers.move_to_end(payer)
+
+                f.write(_csv_row(record))
+                counts[payer] += 1
+        finally:
+            for f in writers.values():
+                f.close()
+
+        for payer, csv_path in output_files.items():
+            log_timing(f"  Payer {payer}: {counts[payer]} records -> {csv_path}")
 
         log_timing(f"Grouped into {len(output_files)} payer account files")
-        return output_files
+        return output_files, counts
 
     def upload_vtags(
         self,
@@ -180,6 +237,7 @@ class VtagUploadService:
         account_key: str,
         csv_file: str,
         description: str = "",
+        vtag_count: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Upload a CSV vtag file to the Umbrella API.
@@ -187,56 +245,66 @@ class VtagUploadService:
         Args:
             umbrella_client: Client for Umbrella API.
             account_key: Umbrella account key.
-            csv_file: Path to CSV file to upload.
+            csv_file: Path to CSV file to upload (gzip-compressed if it ends in .gz).
             description: Optional description for the upload.
+            vtag_count: Number of data rows in csv_file, if already known.
+                Otherwise the file is parsed to count them.
 
         Returns:
             Dict with upload results.
         """
         self._cancelled = False
+        return self._upload_csv(
+            umbrella_client, account_key, csv_file, description, vtag_count
+        )
+
+    def _upload_csv(
+        self,
+        umbrella_client,
+        account_key: str,
+        csv_file: str,
+        description: str = "",
+        vtag_count: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Upload a single CSV without resetting the cancellation flag."""
         log_timing(f"Uploading vtags: {csv_file}")
 
-        # Count records in CSV
-        vtag_count = 0
-        with open(csv_file, "r") as f:
-            reader = csv.reader(f)
-            next(reader, None)  # Skip header
-            for _ in reader:
-                vtag_count += 1
+        # Files generated here pass their row count in; anything else is
+        # parsed, since quoted values may contain embedded newlines
+        if vtag_count is None:
+            with _open_csv(csv_file, "r") as f:
+                vtag_count = max(sum(1 for _ in csv.reader(f)) - 1, 0)
 
-        # Create upload record
+        # Create upload record (a cancelled upload is recorded in one write).
+        # The record is committed before the network upload so no write
+        # transaction is held open while the file is sent.
+        cancelled = self._cancelled
         upload_id = execute_write(
             """INSERT INTO vtag_uploads
             (upload_date, file_name, vtag_count, status, created_at)
-            VALUES (?, ?, ?, 'uploading', CURRENT_TIMESTAMP)""",
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)""",
             (
                 datetime.now().strftime("%Y-%m-%d"),
                 os.path.basename(csv_file),
                 vtag_count,
+                "cancelled" if cancelled else "uploading",
             ),
         )
+        if cancelled:
+            return {"upload_id": upload_id, "status": "cancelled"}
 
         try:
-            if self._cancelled:
-                execute_write(
-                    """UPDATE vtag_uploads SET status = 'cancelled',
-                    updated_at = CURRENT_TIMESTAMP WHERE id = ?""",
-                    (upload_id,),
-                )
-                return {"upload_id": upload_id, "status": "cancelled"}
-
-            # Read CSV content for upload
-            with open(csv_file, "r") as f:
-                csv_content = f.read()
-
-            # Upload via umbrella client
-            response = umbrella_client.upload_virtual_tags(
+            # Upload via umbrella client (file is sent as-is, already gzipped if .gz)
+            import_id = umbrella_client.upload_virtual_tags(
+                csv_path=csv_file,
                 account_key=account_key,
-                vtag_csv_content=csv_content,
+                compressed=csv_file.endswith(".gz"),
             )
+            response = {"upload_id": import_id}
 
-            # Update upload record
-            status = "completed" if response.get("status", "").lower() in ("completed", "complete", "success") else "submitted"
+            # Update upload record (upload_virtual_tags only returns the
+            # import id; completion is tracked separately via monitor_import)
+            status = "submitted"
             execute_write(
                 """UPDATE vtag_uploads SET
                 status = ?,
@@ -245,7 +313,7 @@ class VtagUploadService:
                 WHERE id = ?""",
                 (
                     status,
-                    json.dumps(response),
+                    orjson.dumps(response).decode(),
                     upload_id,
                 ),
             )
@@ -280,6 +348,7 @@ class VtagUploadService:
         jsonl_file: str,
         group_by_payer: bool = False,
         description: str = "",
+        compressed: bool = True,
     ) -> Dict[str, Any]:
         """
         Convert JSONL to CSV and upload to Umbrella.
@@ -290,6 +359,7 @@ class VtagUploadService:
             jsonl_file: Path to JSONL file.
             group_by_payer: If True, group by payer account and upload separately.
             description: Optional description for the upload.
+            compressed: If True, gzip the CSV during conversion and upload it compressed.
 
         Returns:
             Dict with upload results.
@@ -297,25 +367,44 @@ class VtagUploadService:
         self._cancelled = False
 
         if group_by_payer:
-            csv_files = self.group_jsonl_by_payer_account(jsonl_file)
+            csv_files, counts = self._group_jsonl_by_payer_account(
+                jsonl_file, compressed=compressed
+            )
             results = {}
-            for payer, csv_path in csv_files.items():
-                if self._cancelled:
-                    break
-                results[payer] = self.upload_vtags(
-                    umbrella_client=umbrella_client,
-                    account_key=account_key,
-                    csv_file=csv_path,
-                    description=f"{description} (payer: {payer})",
-                )
-            return {"status": "completed", "payer_uploads": results}
+            # Uploads are I/O-bound (presigned PUT + JSON round-trips), so
+            # run them concurrently; cancellation is checked per completion.
+            with ThreadPoolExecutor(max_workers=UPLOAD_MAX_WORKERS) as pool:
+                futures = {
+                    pool.submit(
+                        self._upload_csv,
+                        umbrella_client,
+                        account_key,
+                        csv_path,
+                        f"{description} (payer: {payer})",
+                        counts[payer],
+                    ): payer
+                    for payer, csv_path in csv_files.items()
+                }
+                try:
+                    for future in as_completed(futures):
+                        results[futures[future]] = future.result()
+                        if self._cancelled:
+                            break
+                finally:
+                    for future in futures:
+                        future.cancel()
+            status = "cancelled" if self._cancelled else "completed"
+            return {"status": status, "payer_uploads": results}
         else:
-            csv_file = self.convert_jsonl_to_csv(jsonl_file)
+            csv_file, vtag_count = self._convert_jsonl_to_csv(
+                jsonl_file, compressed=compressed
+            )
             return self.upload_vtags(
                 umbrella_client=umbrella_client,
                 account_key=account_key,
                 csv_file=csv_file,
                 description=description,
+                vtag_count=vtag_count,
             )
 
     def list_uploads(
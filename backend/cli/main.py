@@ -13,13 +13,13 @@ Ported from BPVtagger with:
 - VTagger branding throughout
 """
 
-import calendar
 import json
 import os
 import sys
+from contextlib import nullcontext
 from datetime import datetime, date, timedelta
-from pathlib import Path
-from typing import Optional
+from itertools import islice
+from typing import NamedTuple, Optional
 
 import click
 
@@ -68,10 +68,9 @@ def dimensions_list():
     click.echo("-" * 85)
 
     for dim in mapping_engine._sorted_dimensions:
-        stmt_count = len(dim.statements) if dim.statements else 0
         click.echo(
             f"{dim.index:<4} {dim.vtag_name:<30} {dim.kind:<15} "
-            f"{stmt_count:<12} {dim.default_value}"
+            f"{dim.statement_count:<12} {dim.default_value}"
         )
 
     click.echo()
@@ -93,49 +92,51 @@ def dimensions_validate(file_path: str):
     FILE_PATH is the path to a JSON file containing dimension definitions.
     Expected format: a JSON array of dimension objects, or a single dimension object.
     """
-    from app.core.dsl_parser import validate_dimension_json
-
-    try:
-        with open(file_path) as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        click.echo(f"Error: Invalid JSON in {file_path}: {e}", err=True)
-        sys.exit(1)
-
-    # Normalize to list
-    if isinstance(data, dict):
-        if "dimensions" in data:
-            dims = data["dimensions"]
-        else:
-            dims = [data]
-    elif isinstance(data, list):
-        dims = data
+    dims, streamed = _iter_dimensions(file_path)
+    if streamed:
+        click.echo(f"Validating dimensions from {file_path} (streaming)...\n")
     else:
-        click.echo("Error: Expected a JSON object or array.", err=True)
-        sys.exit(1)
+        click.echo(f"Validating {len(dims)} dimension(s) from {file_path}...\n")
 
-    click.echo(f"Validating {len(dims)} dimension(s) from {file_path}...\n")
+    # Validation is CPU-bound, so very large files are fanned out to a
+    # process pool once PARALLEL_VALIDATE_MIN dimensions have been read
+    # (streamed input has no length up front). The file is still read in
+    # this process, chunk by chunk, so parse errors surface here and results
+    # keep their original order.
+    pool = None
+    seen = 0 if streamed else len(dims)
 
     all_valid = True
-    for i, dim in enumerate(dims):
-        # Ensure vtag_name or vtagName is present
-        vtag_name = dim.get("vtag_name") or dim.get("vtagName") or dim.get("name", f"dimension_{i}")
-
-        # Normalize to validation format
-        content = {
-            "vtag_name": vtag_name,
-            "statements": dim.get("statements", []),
-        }
-
-        errors = validate_dimension_json(content)
-        if errors:
-            all_valid = False
-            click.echo(f"  [{i}] {vtag_name}: INVALID")
-            for err in errors:
-                click.echo(f"      - {err}")
-        else:
-            stmt_count = len(dim.get("statements", []))
-            click.echo(f"  [{i}] {vtag_name}: OK ({stmt_count} statements)")
+    try:
+        with _LineBuffer() as out:
+            items = enumerate(dims)
+            while True:
+                chunk = list(islice(items, VALIDATE_CHUNK_SIZE))
+                if not chunk:
+                    break
+                if streamed:
+                    seen += len(chunk)
+                if pool is None and seen >= PARALLEL_VALIDATE_MIN:
+                    import multiprocessing
+                    pool = multiprocessing.Pool(
+                        min(os.cpu_count() or 1, VALIDATE_MAX_WORKERS)
+                    )
+                if pool is not None:
+                    results = pool.map(_validate_one, chunk, chunksize=VALIDATE_POOL_CHUNKSIZE)
+                else:
+                    results = map(_validate_one, chunk)
+                for i, vtag_name, stmt_count, errors in results:
+                    if errors:
+                        all_valid = False
+                        out(f"  [{i}] {vtag_name}: INVALID")
+                        for err in errors:
+                            out(f"      - {err}")
+                    else:
+                        out(f"  [{i}] {vtag_name}: OK ({stmt_count} statements)")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
 
     click.echo()
     if all_valid:
@@ -145,109 +146,209 @@ def dimensions_validate(file_path: str):
         sys.exit(1)
 
 
+# dimensions validate switches to a process pool once this many dimensions
+# have been read. A dimension validates in ~13-250 us while pool startup and
+# pickling cost ~0.1-0.15 s, so smaller files are faster serially.
+PARALLEL_VALIDATE_MIN = 20000
+# Upper bound on validate pool workers
+VALIDATE_MAX_WORKERS = 8
+# Dimensions read from the file and validated per pool.map call
+VALIDATE_CHUNK_SIZE = 4096
+# Dimensions per task sent to a pool worker
+VALIDATE_POOL_CHUNKSIZE = 256
+
+
+def _validate_one(item):
+    """Validate one (position, dimension) pair; runs in pool workers.
+
+    Returns (position, display name, statement count, errors).
+    """
+    from app.core.dsl_parser import validate_dimension_json
+
+    i, dim = item
+    nd = _normalize(dim)
+    vtag_name = nd.vtag_name or f"dimension_{i}"
+
+    # Normalize to validation format
+    content = {
+        "vtag_name": vtag_name,
+        "statements": nd.statements,
+    }
+    stmt_count = len(nd.statements) if isinstance(nd.statements, list) else 0
+    return i, vtag_name, stmt_count, validate_dimension_json(content)
+
+
+# Rows per executemany call in dimensions import
+IMPORT_BATCH_SIZE = 5000
+
+_DIMENSION_INSERT_SQL = """INSERT INTO dimensions
+    (vtag_name, index_number, kind, default_value, source,
+     content, statement_count, checksum)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(vtag_name) DO NOTHING"""
+
+_DIMENSION_UPSERT_SQL = """INSERT INTO dimensions
+    (vtag_name, index_number, kind, default_value, source,
+     content, statement_count, checksum)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(vtag_name) DO UPDATE SET
+        index_number = excluded.index_number,
+        kind = excluded.kind,
+        default_value = excluded.default_value,
+        source = excluded.source,
+        content = excluded.content,
+        statement_count = excluded.statement_count,
+        checksum = excluded.checksum,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE dimensions.checksum IS NOT excluded.checksum"""
+
+
 @dimensions.command("import")
 @click.argument("file_path", type=click.Path(exists=True))
 @click.option("--replace", is_flag=True, help="Replace existing dimensions with same name.")
-def dimensions_import(file_path: str, replace: bool):
+@click.option("--verbose", "-v", is_flag=True, help="Print a line for every dimension.")
+@click.option("--strict", is_flag=True,
+              help="Validate while importing; import nothing if any dimension is invalid.")
+def dimensions_import(file_path: str, replace: bool, verbose: bool, strict: bool):
     """Import dimensions from a JSON file into the database.
 
     FILE_PATH is the path to a JSON file containing dimension definitions.
+
+    The import is atomic: if it fails, nothing is written.
+
+    With --strict every dimension is also checked as in 'dimensions
+    validate', and nothing is imported if any of them is invalid.
     """
     _ensure_app_context()
-    from app.database import execute_query, execute_write
+    from app.database import batch, execute_query
+    from app.core.dsl_parser import serialize_dimension
     from app.services.mapping_engine import mapping_engine
 
-    try:
-        with open(file_path) as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        click.echo(f"Error: Invalid JSON in {file_path}: {e}", err=True)
-        sys.exit(1)
-
-    # Normalize to list
-    if isinstance(data, dict):
-        if "dimensions" in data:
-            dims = data["dimensions"]
-        else:
-            dims = [data]
-    elif isinstance(data, list):
-        dims = data
+    dims, streamed = _iter_dimensions(file_path)
+    if streamed:
+        click.echo(f"Importing dimensions from {file_path} (streaming)...\n")
     else:
-        click.echo("Error: Expected a JSON object or array.", err=True)
-        sys.exit(1)
-
-    click.echo(f"Importing {len(dims)} dimension(s) from {file_path}...\n")
+        click.echo(f"Importing {len(dims)} dimension(s) from {file_path}...\n")
 
     imported = 0
     updated = 0
     skipped = 0
 
-    for dim in dims:
-        vtag_name = dim.get("vtagName") or dim.get("vtag_name") or dim.get("name", "")
-        if not vtag_name:
-            click.echo(f"  Skipping dimension without name: {dim}")
-            skipped += 1
-            continue
-
-        index = dim.get("index", dim.get("index_number", 0))
-        kind = dim.get("kind", "TAG_MAPPING")
-        default_value = dim.get("defaultValue", dim.get("default_value", "Unallocated"))
-        source = dim.get("source", "TAGS")
-        statements = dim.get("statements", [])
-
-        # Build content JSON
-        content = {
-            "vtagName": vtag_name,
-            "index": index,
-            "kind": kind,
-            "defaultValue": default_value,
-            "source": source,
-            "statements": statements,
-        }
-        content_json = json.dumps(content)
-
-        # Compute checksum
-        import hashlib
-        raw = json.dumps(content, sort_keys=True, separators=(",", ":"))
-        checksum = hashlib.md5(raw.encode()).hexdigest()
-
-        # Check if exists
-        existing = execute_query(
-            "SELECT id FROM dimensions WHERE vtag_name = ?", (vtag_name,)
+    # One query for all existing names (and their content checksums) instead
+    # of a SELECT per dimension
+    existing = {
+        r["vtag_name"]: r["checksum"]
+        for r in execute_query("SELECT vtag_name, checksum FROM dimensions")
+    }
+
+    # One UPSERT (vtag_name is UNIQUE) for inserts and replacements alike.
+    # Rows are flushed every IMPORT_BATCH_SIZE dimensions with executemany
+    # so memory stays bounded; all batches share a single transaction, so a
+    # failed import leaves the dimensions table unchanged.
+    sql = _DIMENSION_UPSERT_SQL if replace else _DIMENSION_INSERT_SQL
+    rows = []
+
+    # Without --verbose a progress bar (hidden when stdout is not a TTY)
+    # stands in for the per-row lines
+    if verbose:
+        progress = nullcontext(dims)
+    else:
+        total = None if streamed else len(dims)
+        progress = click.progressbar(
+            dims, label="Importing", length=total,
+            # Redraw at most ~100 times over the import
+            update_min_steps=max(1, (total or 10000) // 100),
         )
 
-        if existing:
-            if replace:
-                execute_write(
-                    """UPDATE dimensions SET
-                    index_number = ?, kind = ?, default_value = ?, source = ?,
-                    content = ?, statement_count = ?, checksum = ?,
-                    updated_at = CURRENT_TIMESTAMP
-                    WHERE vtag_name = ?""",
-                    (index, kind, default_value, source, content_json,
-                     len(statements), checksum, vtag_name),
-                )
-                click.echo(f"  Updated: {vtag_name} ({len(statements)} statements)")
-                updated += 1
-            else:
-                click.echo(f"  Skipped (exists): {vtag_name}")
+    invalid = 0
+
+    with _LineBuffer() as out, batch() as cur, progress as items:
+        for i, dim in enumerate(items):
+            if strict:
+                _, display_name, _, errors = _validate_one((i, dim))
+                if errors:
+                    invalid += 1
+                    out(f"  [{i}] {display_name}: INVALID")
+                    for err in errors:
+                        out(f"      - {err}")
+                    continue
+
+            nd = _normalize(dim)
+            vtag_name = nd.vtag_name
+            if not vtag_name:
+                out(f"  Skipping dimension without name: {dim}")
                 skipped += 1
-        else:
-            execute_write(
-                """INSERT INTO dimensions
-                (vtag_name, index_number, kind, default_value, source,
-                 content, statement_count, checksum)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (vtag_name, index, kind, default_value, source,
-                 content_json, len(statements), checksum),
+                continue
+
+            # Build content JSON
+            content = {
+                "vtagName": vtag_name,
+                "index": nd.index,
+                "kind": nd.kind,
+                "defaultValue": nd.default_value,
+                "source": nd.source,
+                "statements": nd.statements,
+            }
+
+            # Serialized once; the stored JSON and the checksum share the bytes
+            content_json, checksum = serialize_dimension(content)
+
+            row = (vtag_name, nd.index, nd.kind, nd.default_value, nd.source,
+                   content_json, len(nd.statements), checksum)
+
+            if vtag_name in existing:
+                if replace and existing[vtag_name] == checksum:
+                    # Same content: no write, and updated_at is left alone
+                    if verbose:
+                        out(f"  Unchanged: {vtag_name}")
+                    skipped += 1
+                elif replace:
+                    rows.append(row)
+                    existing[vtag_name] = checksum
+                    if verbose:
+                        out(f"  Updated: {vtag_name} ({len(nd.statements)} statements)")
+                    updated += 1
+                else:
+                    if verbose:
+                        out(f"  Skipped (exists): {vtag_name}")
+                    skipped += 1
+            else:
+                rows.append(row)
+                # A repeated name later in the same file updates this row
+                existing[vtag_name] = checksum
+                if verbose:
+                    out(f"  Imported: {vtag_name} ({len(nd.statements)} statements)")
+                imported += 1
+
+            if len(rows) >= IMPORT_BATCH_SIZE:
+                cur.executemany(sql, rows)
+                rows.clear()
+
+        if rows:
+            cur.executemany(sql, rows)
+
+        if invalid:
+            out.flush()
+            click.echo(
+                f"\nAborted: {invalid} invalid dimension(s); nothing was imported.",
+                err=True,
             )
-            click.echo(f"  Imported: {vtag_name} ({len(statements)} statements)")
-            imported += 1
+            # Exiting inside batch() closes the connection without a
+            # commit, which rolls back everything written above
+            sys.exit(1)
 
-    # Reload mapping engine
-    mapping_engine.load_dimensions()
+        # Rows actually written (conflicts skipped by the UPSERT don't count)
+        changes = cur.connection.total_changes
 
     click.echo(f"\nDone: {imported} imported, {updated} updated, {skipped} skipped.")
+
+    if not changes:
+        # Nothing written, so the loaded dimensions are already current
+        click.echo("No changes detected.")
+        return
+
+    # Reload mapping engine
+    mapping_engine.load_dimensions()
     click.echo(f"Total dimensions loaded: {len(mapping_engine.dimensions)}")
 
 
@@ -259,39 +360,48 @@ def dimensions_export(output_path: str):
     OUTPUT_PATH is the destination file path (default: dimensions_export.json).
     """
     _ensure_app_context()
-    from app.database import execute_query
-
-    rows = execute_query(
+    import orjson
+    from app.database import execute_query_iter
+
+    # Rows are streamed from the cursor and written one dimension at a time,
+    # so peak memory is a single row regardless of how many are exported.
+    # The output is JSON-equivalent to dumping {"dimensions": [...]} at once,
+    # except that non-ASCII text is written as raw UTF-8 rather than \u escapes.
+    rows = execute_query_iter(
         "SELECT vtag_name, index_number, kind, default_value, source, content "
         "FROM dimensions ORDER BY index_number"
     )
-
-    if not rows:
+    row = next(rows, None)
+    if row is None:
         click.echo("No dimensions to export.")
         return
 
-    dims = []
-    for row in rows:
-        try:
-            content = json.loads(row["content"]) if row["content"] else {}
-        except (json.JSONDecodeError, TypeError):
-            content = {}
-
-        dims.append({
-            "vtagName": row["vtag_name"],
-            "index": row["index_number"],
-            "kind": row["kind"],
-            "defaultValue": row["default_value"],
-            "source": row["source"],
-            "statements": content.get("statements", []),
-        })
-
-    output = {"dimensions": dims}
-
-    with open(output_path, "w") as f:
-        json.dump(output, f, indent=2)
-
-    click.echo(f"Exported {len(dims)} dimensions to {output_path}")
+    count = 0
+    with open(output_path, "wb") as f:
+        f.write(b'{\n  "dimensions": [\n')
+        while row is not None:
+            try:
+                content = orjson.loads(row["content"]) if row["content"] else {}
+            except (orjson.JSONDecodeError, TypeError):
+                content = {}
+
+            dim = {
+                "vtagName": row["vtag_name"],
+                "index": row["index_number"],
+                "kind": row["kind"],
+                "defaultValue": row["default_value"],
+                "source": row["source"],
+                "statements": content.get("statements", []),
+            }
+            if count:
+                f.write(b",\n")
+            f.write(b"    ")
+            f.write(orjson.dumps(dim, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n    "))
+            count += 1
+            row = next(rows, None)
+        f.write(b"\n  ]\n}")
+
+    click.echo(f"Exported {count} dimensions to {output_path}")
 
 
 @dimensions.command("resolve")
@@ -301,7 +411,14 @@ def dimensions_resolve(tags_json: str):
 
     TAGS_JSON is a JSON string of tag key-value pairs, e.g.:
     '{"Environment": "production", "Team": "platform"}'
+
+    Pass "-" to resolve many tag sets in one run: one JSON object per line
+    on stdin, one JSON object of resolved dimensions per line on stdout.
     """
+    if tags_json == "-":
+        _resolve_stream()
+        return
+
     _ensure_app_context()
     from app.services.mapping_engine import mapping_engine
 
@@ -336,6 +453,49 @@ def dimensions_resolve(tags_json: str):
     click.echo(f"\n{matched}/{len(results)} dimensions matched.")
 
 
+def _resolve_stream():
+    """Batch mode of dimensions resolve: JSON lines in, JSON lines out.
+
+    Dimensions are loaded once for the whole stream, so a script resolving
+    many tag sets pays the startup and load cost a single time.
+    """
+    from contextlib import redirect_stdout
+
+    import orjson
+
+    # Keep stdout pure JSON lines: setup/load messages go to stderr
+    with redirect_stdout(sys.stderr):
+        _ensure_app_context()
+        from app.services.mapping_engine import mapping_engine
+
+        mapping_engine.load_dimensions()
+    if not mapping_engine.dimensions:
+        click.echo("Error: No dimensions loaded. Import dimensions first.", err=True)
+        sys.exit(1)
+
+    # Batch writes only when stdin is a regular file; on a pipe or terminal
+    # each result is written (and flushed) as soon as its line is read, so a
+    # caller can send one line and wait for the answer.
+    import stat
+    chunk = OUTPUT_FLUSH_LINES if stat.S_ISREG(os.fstat(sys.stdin.fileno()).st_mode) else 1
+
+    with _LineBuffer(chunk=chunk) as out:
+        for lineno, line in enumerate(sys.stdin.buffer, 1):
+            if not line.strip():
+                continue
+            try:
+                tags = orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                out.flush()
+                click.echo(f"Error: Invalid JSON on line {lineno}: {e}", err=True)
+                sys.exit(1)
+            if not isinstance(tags, dict):
+                out.flush()
+                click.echo(f"Error: Line {lineno}: expected a JSON object of tag key-value pairs.", err=True)
+                sys.exit(1)
+            out(orjson.dumps(mapping_engine.resolve_tags(tags)).decode())
+
+
 # ---------------------------------------------------------------------------
 # Sync Commands
 # ---------------------------------------------------------------------------
@@ -343,25 +503,19 @@ def dimensions_resolve(tags_json: str):
 
 def get_weeks_for_month(year: int, month: int):
     """Get all ISO weeks that cover any day in the given month."""
+    import calendar
+
     first_day = date(year, month, 1)
     last_day = date(year, month, calendar.monthrange(year, month)[1])
 
-    weeks = []
-    seen_weeks = set()
-    current = first_day
-
-    while current <= last_day:
-        iso_cal = current.isocalendar()
-        iso_year = iso_cal[0]
-        week_num = iso_cal[1]
-
-        if (week_num, iso_year) not in seen_weeks:
-            seen_weeks.add((week_num, iso_year))
-            weeks.append((week_num, iso_year))
-
-        current += timedelta(days=1)
+    # ISO weeks are 7 days long, so one sample per week (plus the last day)
+    # covers every week touching the month; dict.fromkeys dedupes in order.
+    samples = [first_day + timedelta(days=d) for d in range(0, last_day.day, 7)]
+    samples.append(last_day)
 
-    return weeks
+    return list(dict.fromkeys(
+        (d.isocalendar()[1], d.isocalendar()[0]) for d in samples
+    ))
 
 
 @cli.command()
@@ -374,7 +528,9 @@ def get_weeks_for_month(year: int, month: int):
 @click.option("--vtag-filter", multiple=True, help="Filter to specific dimension names.")
 @click.option("--filter-mode", default="not_vtagged", help="Filter mode: not_vtagged, all. Default: not_vtagged.")
 @click.option("--dry-run", is_flag=True, help="Simulate without uploading (fetch + map only).")
-def sync(week, year, from_month, from_year, to_month, to_year, vtag_filter, filter_mode, dry_run):
+@click.option("--parallel", "-p", type=click.IntRange(min=1), default=1,
+              help="Weeks to run concurrently in a multi-month --dry-run. Default: 1.")
+def sync(week, year, from_month, from_year, to_month, to_year, vtag_filter, filter_mode, dry_run, parallel):
     """Sync virtual tags for a specific week or month range.
 
     Downloads assets from Umbrella, applies dimension mappings,
@@ -386,13 +542,9 @@ def sync(week, year, from_month, from_year, to_month, to_year, vtag_filter, filt
         vtagger sync --week 5 --year 2026         # Specific week
         vtagger sync --from-month 11 --from-year 2025 --to-month 2 --to-year 2026
         vtagger sync --dry-run                    # Simulate only
+        vtagger sync --from-month 1 --to-month 6 --dry-run --parallel 4
     """
-    _ensure_app_context()
-    from app.services.mapping_engine import mapping_engine
-    from app.services.umbrella_client import umbrella_client, UmbrellaClient
-    from app.services.sync_service import sync_service
-
-    # Check mutually exclusive options
+    # Check mutually exclusive options (before loading any backend modules)
     has_week = week is not None
     has_month_range = from_month is not None or to_month is not None
 
@@ -400,6 +552,10 @@ def sync(week, year, from_month, from_year, to_month, to_year, vtag_filter, filt
         click.echo("Error: Cannot use --week with --from-month/--to-month. Choose one mode.", err=True)
         sys.exit(1)
 
+    _ensure_app_context()
+    from app.services.mapping_engine import mapping_engine
+    from app.services.umbrella_client import umbrella_client, UmbrellaClient
+
     click.echo("VTagger - Virtual Tagging Agent")
     click.echo("=" * 40)
 
@@ -438,37 +594,64 @@ def sync(week, year, from_month, from_year, to_month, to_year, vtag_filter, filt
             sys.exit(1)
 
         # Build list of months
-        months_to_sync = []
-        cy, cm = from_year, from_month
-        while (cy, cm) <= (to_year, to_month):
-            months_to_sync.append((cy, cm))
-            cm += 1
-            if cm > 12:
-                cm = 1
-                cy += 1
-
-        # Deduplicated weeks across all months
-        all_weeks = []
-        seen_weeks = set()
-        for y, m in months_to_sync:
-            for week_num, iso_year in get_weeks_for_month(y, m):
-                if (week_num, iso_year) not in seen_weeks:
-                    seen_weeks.add((week_num, iso_year))
-                    all_weeks.append((week_num, iso_year))
+        months_to_sync = [
+            (i // 12, i % 12 + 1)
+            for i in range(from_year * 12 + from_month - 1, to_year * 12 + to_month)
+        ]
+
+        # Deduplicated weeks across all months (order-preserving)
+        all_weeks = list(dict.fromkeys(
+            wk for y, m in months_to_sync for wk in get_weeks_for_month(y, m)
+        ))
 
         click.echo(f"\nMulti-month sync: {from_month}/{from_year} to {to_month}/{to_year}")
         click.echo(f"Weeks to sync: {len(all_weeks)}")
         click.echo(f"Mode: {'Dry Run (no upload)' if dry_run else 'Full Sync'}")
+
+        # Weeks are independent fetch + map runs, so dry runs can overlap
+        # their network I/O. Full syncs share sync_service's run state and
+        # stay sequential.
+        workers = min(parallel, len(all_weeks)) if dry_run else 1
+        if parallel > 1 and not dry_run:
+            click.echo("Note: --parallel only applies to --dry-run; weeks will run sequentially.")
+        elif workers > 1:
+            click.echo(f"Parallel weeks: {workers}")
         click.echo()
 
-        for idx, (wk, yr) in enumerate(all_weeks, 1):
-            start_date, end_date = UmbrellaClient.get_week_date_range(wk, yr)
-            click.echo(f"[{idx}/{len(all_weeks)}] Week {wk}/{yr} ({start_date})")
+        if workers > 1:
+            from concurrent.futures import ThreadPoolExecutor, as_completed
+
+            def run_week(wk, yr):
+                # Buffer each week's output and print it as one block on
+                # completion, so concurrent weeks don't interleave lines
+                lines = []
+                start_date, end_date = UmbrellaClient.get_week_date_range(wk, yr)
+                _run_cli_sync(
+                    umbrella_client, mapping_engine,
+                    start_date, end_date, vtag_filter_dims, filter_mode, dry_run,
+                    echo=lambda message="", err=False: lines.append((message, err)),
+                )
+                return start_date, lines
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(run_week, wk, yr): (wk, yr) for wk, yr in all_weeks
+                }
+                for idx, future in enumerate(as_completed(futures), 1):
+                    wk, yr = futures[future]
+                    start_date, lines = future.result()
+                    click.echo(f"[{idx}/{len(all_weeks)}] Week {wk}/{yr} ({start_date})")
+                    for message, err in lines:
+                        click.echo(message, err=err)
+        else:
+            for idx, (wk, yr) in enumerate(all_weeks, 1):
+                start_date, end_date = UmbrellaClient.get_week_date_range(wk, yr)
+                click.echo(f"[{idx}/{len(all_weeks)}] Week {wk}/{yr} ({start_date})")
 
-            _run_cli_sync(
-                sync_service, umbrella_client, mapping_engine,
-                start_date, end_date, vtag_filter_dims, filter_mode, dry_run,
-            )
+                _run_cli_sync(
+                    umbrella_client, mapping_engine,
+                    start_date, end_date, vtag_filter_dims, filter_mode, dry_run,
+                )
 
         click.echo(f"\nMulti-month sync completed!")
 
@@ -490,14 +673,19 @@ def sync(week, year, from_month, from_year, to_month, to_year, vtag_filter, filt
         click.echo()
 
         _run_cli_sync(
-            sync_service, umbrella_client, mapping_engine,
+            umbrella_client, mapping_engine,
             start_date, end_date, vtag_filter_dims, filter_mode, dry_run,
         )
 
 
-def _run_cli_sync(sync_service, umbrella_client, mapping_engine,
-                   start_date, end_date, vtag_filter_dims, filter_mode, dry_run):
-    """Run a single sync and print results."""
+def _run_cli_sync(umbrella_client, mapping_engine,
+                   start_date, end_date, vtag_filter_dims, filter_mode, dry_run,
+                   echo=click.echo):
+    """Run a single sync and print results via ``echo``.
+
+    Only the backend for the selected mode is imported: simulation_service
+    for dry runs, sync_service for full syncs.
+    """
     try:
         if dry_run:
             # Dry run: use simulation (fetch + map only, no upload)
@@ -512,18 +700,19 @@ def _run_cli_sync(sync_service, umbrella_client, mapping_engine,
                 filter_mode=filter_mode,
             )
             # SimulationResults is a dataclass, access attrs directly
-            click.echo(f"  Status: {sim_result.status}")
-            click.echo(f"  Total assets:  {sim_result.total_assets:,}")
-            click.echo(f"  Matched:       {sim_result.matched_assets:,}")
-            click.echo(f"  Unmatched:     {sim_result.unmatched_assets:,}")
-            click.echo(f"  Match rate:    {sim_result.match_rate:.1f}%")
+            echo(f"  Status: {sim_result.status}")
+            echo(f"  Total assets:  {sim_result.total_assets:,}")
+            echo(f"  Matched:       {sim_result.matched_assets:,}")
+            echo(f"  Unmatched:     {sim_result.unmatched_assets:,}")
+            echo(f"  Match rate:    {sim_result.match_rate:.1f}%")
             if sim_result.output_file:
-                click.echo(f"  Output file:   {sim_result.output_file}")
+                echo(f"  Output file:   {sim_result.output_file}")
             if sim_result.error_message:
-                click.echo(f"  Error: {sim_result.error_message}", err=True)
-            click.echo("  (Dry run - no upload)")
+                echo(f"  Error: {sim_result.error_message}", err=True)
+            echo("  (Dry run - no upload)")
         else:
             # Full sync: fetch + map + upload
+            from app.services.sync_service import sync_service
             result = sync_service.run_week_sync(
                 umbrella_client=umbrella_client,
                 mapping_engine=mapping_engine,
@@ -535,25 +724,25 @@ def _run_cli_sync(sync_service, umbrella_client, mapping_engine,
             )
 
             status = result.get("status", "unknown")
-            click.echo(f"  Status: {status}")
+            echo(f"  Status: {status}")
 
             stats = result.get("stats", {})
             if stats:
-                click.echo(f"  Total assets:  {stats.get('total_assets', 0):,}")
-                click.echo(f"  Matched:       {stats.get('matched_assets', 0):,}")
-                click.echo(f"  Unmatched:     {stats.get('unmatched_assets', 0):,}")
+                echo(f"  Total assets:  {stats.get('total_assets', 0):,}")
+                echo(f"  Matched:       {stats.get('matched_assets', 0):,}")
+                echo(f"  Unmatched:     {stats.get('unmatched_assets', 0):,}")
 
             uploads = result.get("uploads", [])
             if uploads:
-                click.echo(f"  Uploads:       {len(uploads)}")
+                echo(f"  Uploads:       {len(uploads)}")
                 for u in uploads:
-                    click.echo(f"    - {u.get('account_name', 'N/A')}: {u.get('upload_id', 'N/A')}")
+                    echo(f"    - {u.get('account_name', 'N/A')}: {u.get('upload_id', 'N/A')}")
 
             if result.get("error_message"):
-                click.echo(f"  Error: {result['error_message']}", err=True)
+                echo(f"  Error: {result['error_message']}", err=True)
 
     except Exception as e:
-        click.echo(f"  Error: {e}", err=True)
+        echo(f"  Error: {e}", err=True)
 
 
 # ---------------------------------------------------------------------------
@@ -680,13 +869,148 @@ def info():
 # ---------------------------------------------------------------------------
 
 
+# Per-row CLI output is written in chunks of this many lines
+OUTPUT_FLUSH_LINES = 1000
+
+
+class _LineBuffer:
+    """Collect output lines and write them in chunks instead of per echo.
+
+    Used as a context manager so whatever is buffered is flushed on exit,
+    including when the block raises.
+    """
+
+    def __init__(self, err: bool = False, chunk: int = OUTPUT_FLUSH_LINES):
+        self.err = err
+        self.chunk = chunk
+        self.lines = []
+
+    def __call__(self, message: str = ""):
+        self.lines.append(message)
+        if len(self.lines) >= self.chunk:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            click.echo("\n".join(self.lines), err=self.err)
+            self.lines.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+        return False
+
+
+class NormDim(NamedTuple):
+    """A dimension definition with its field aliases resolved."""
+
+    vtag_name: str
+    index: int
+    kind: str
+    default_value: str
+    source: str
+    statements: list
+
+
+def _normalize(dim: dict) -> NormDim:
+    """Resolve the accepted key aliases of a dimension dict in one place.
+
+    Accepts both export-style (vtagName, defaultValue) and DB-style
+    (vtag_name, index_number, default_value) keys. A missing name is "".
+    """
+    get = dim.get
+    return NormDim(
+        vtag_name=get("vtagName") or get("vtag_name") or get("name") or "",
+        index=get("index", get("index_number", 0)),
+        kind=get("kind", "TAG_MAPPING"),
+        default_value=get("defaultValue", get("default_value", "Unallocated")),
+        source=get("source", "TAGS"),
+        statements=get("statements", []),
+    )
+
+
+# Dimension files larger than this are stream-parsed with ijson (if installed)
+STREAM_PARSE_MIN_BYTES = 4 * 1024 * 1024
+
+
+def _stream_dimensions(file_path: str):
+    """Incrementally parse dimension dicts from a JSON file with ijson.
+
+    Handles both ``{"dimensions": [...]}`` and a top-level array. A single
+    top-level dimension object is returned as a one-element list. Returns
+    None if ijson is not installed, so the caller falls back to a full parse.
+    """
+    try:
+        import ijson
+    except ImportError:
+        return None
+
+    with open(file_path, "rb") as f:
+        head = f.read(4096).lstrip()
+
+    def generate():
+        yielded = False
+        try:
+            with open(file_path, "rb") as f:
+                prefix = "item" if head.startswith(b"[") else "dimensions.item"
+                for dim in ijson.items(f, prefix, use_float=True):
+                    yielded = True
+                    yield dim
+
+                if not yielded and prefix == "dimensions.item":
+                    # Single dimension object rather than a wrapper
+                    f.seek(0)
+                    data = next(ijson.items(f, "", use_float=True), None)
+                    if isinstance(data, dict) and "dimensions" not in data:
+                        yield data
+        except ijson.JSONError as e:
+            click.echo(f"Error: Invalid JSON in {file_path}: {e}", err=True)
+            sys.exit(1)
+
+    return generate()
+
+
+def _iter_dimensions(file_path: str):
+    """Read dimension dicts from a JSON file for validate/import.
+
+    Returns ``(dims, streamed)``. Files above STREAM_PARSE_MIN_BYTES are
+    parsed incrementally with ijson when it is installed, and ``dims`` is
+    then a generator; otherwise the file is loaded whole and normalized to
+    a list. Exits with an error on invalid JSON or an unexpected top level.
+    """
+    if os.path.getsize(file_path) > STREAM_PARSE_MIN_BYTES:
+        dims = _stream_dimensions(file_path)
+        if dims is not None:
+            return dims, True
+
+    import orjson
+
+    try:
+        with open(file_path, "rb") as f:
+            data = orjson.loads(f.read())
+    except orjson.JSONDecodeError as e:
+        click.echo(f"Error: Invalid JSON in {file_path}: {e}", err=True)
+        sys.exit(1)
+
+    # Normalize to list
+    if isinstance(data, dict):
+        if "dimensions" in data:
+            dims = data["dimensions"]
+        else:
+            dims = [data]
+    elif isinstance(data, list):
+        dims = data
+    else:
+        click.echo("Error: Expected a JSON object or array.", err=True)
+        sys.exit(1)
+
+    return dims, False
+
+
 def _ensure_app_context():
     """Ensure the application context is initialized (DB, config, etc.)."""
-    # Add the backend directory to sys.path if needed
-    backend_dir = Path(__file__).resolve().parent.parent
-    if str(backend_dir) not in sys.path:
-        sys.path.insert(0, str(backend_dir))
-
     from app.database import init_database
     init_database()
 
@@ -697,12 +1021,7 @@ def _ensure_app_context():
 
 
 def main():
-    """Entry point for the vtagger CLI."""
-    # Ensure backend is on path
-    backend_dir = Path(__file__).resolve().parent.parent
-    if str(backend_dir) not in sys.path:
-        sys.path.insert(0, str(backend_dir))
-
+    """Entry point for the vtagger CLI (``pip install -e backend``)."""
     cli()
 
 
@@ -1,7 +1,14 @@
-"""Download all assets for ISO week 1 of 2026 (Dec 29, 2025 - Jan 4, 2026) to CSV."""
+"""Download all assets for ISO week 1 of 2026 (Dec 29, 2025 - Jan 4, 2026) to CSV.
+
+Pass ``--format parquet`` to write a Parquet file instead (requires pyarrow).
+"""
+import argparse
 import csv
+import io
+import queue
 import sys
 import os
+import threading
 
 sys.path.insert(0, os.path.dirname(__file__))
 
@@ -13,7 +20,105 @@ OUTPUT = os.path.expanduser("~/Downloads/all_assets_week1_2026.csv")
 START_DATE = "2025-12-29"
 END_DATE = "2026-01-04"
 
+def prefetch(batches, maxsize=4):
+    """Iterate ``batches`` in a background thread, up to ``maxsize`` ahead.
+
+    Lets the Umbrella fetch keep going while the main thread writes to disk.
+    An exception in the producer is re-raised in the consumer.
+    """
+    q = queue.Queue(maxsize=maxsize)
+    done = object()
+
+    def produce():
+        try:
+            for batch in batches:
+                q.put(batch)
+        except BaseException as e:
+            q.put(e)
+        else:
+            q.put(done)
+
+    threading.Thread(target=produce, daemon=True).start()
+    while True:
+        item = q.get()
+        if item is done:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
+
+
+def write_csv(batches, path):
+    """Write asset batches to CSV; returns the number of assets written.
+
+    Each batch is rendered into an in-memory buffer and written to the file
+    with a single write call.
+    """
+    total = 0
+    with open(path, "wb") as f:
+        fieldnames = None
+
+        for batch in batches:
+            if not batch:
+                continue
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            if fieldnames is None:
+                # Use all columns from first record
+                fieldnames = tuple(batch[0].keys())
+                writer.writerow(fieldnames)
+            # Rows built in the fixed header order (missing fields -> "")
+            writer.writerows([[a.get(k, "") for k in fieldnames] for a in batch])
+            f.write(buf.getvalue().encode("utf-8"))
+            total += len(batch)
+
+    return total
+
+
+def write_parquet(batches, path):
+    """Write asset batches to Parquet (one row group per batch).
+
+    Columns come from the first record and are typed as strings, so every
+    batch has the same schema whatever values the API returns.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        sys.exit("pyarrow is required for --format parquet (pip install pyarrow)")
+
+    total = 0
+    writer = None
+    try:
+        for batch in batches:
+            if not batch:
+                continue
+            if writer is None:
+                fieldnames = tuple(batch[0].keys())
+                schema = pa.schema([(k, pa.string()) for k in fieldnames])
+                writer = pq.ParquetWriter(path, schema, compression="zstd")
+            columns = [
+                pa.array(
+                    [None if (v := a.get(k)) is None else str(v) for a in batch],
+                    type=pa.string(),
+                )
+                for k in fieldnames
+            ]
+            writer.write_batch(pa.RecordBatch.from_arrays(columns, schema=schema))
+            total += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return total
+
+
 def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--format", choices=("csv", "parquet"), default="csv")
+    args = parser.parse_args()
+    output = OUTPUT if args.format == "csv" else os.path.splitext(OUTPUT)[0] + ".parquet"
+
     print(f"Authenticating...")
     umbrella_client._ensure_authenticated()
 
@@ -37,28 +142,18 @@ def main():
 
     print(f"Fetching ALL assets for {START_DATE} to {END_DATE} (filter_mode=all)...")
 
-    total = 0
-    with open(OUTPUT, "w", newline="", encoding="utf-8") as f:
-        writer = None
-
-        for batch in umbrella_client.fetch_assets_stream(
-            account_key=account_key,
-            start_date=START_DATE,
-            end_date=END_DATE,
-            batch_size=5000,
-            filter_mode="all",
-            progress_callback=lambda page, count: print(f"  Page {page}: {count} rows so far..."),
-        ):
-            for asset in batch:
-                if writer is None:
-                    # Use all columns from first record
-                    fieldnames = list(asset.keys())
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                writer.writerow(asset)
-                total += 1
-
-    print(f"\nDone! {total} assets written to {OUTPUT}")
+    batches = umbrella_client.fetch_assets_stream(
+        account_key=account_key,
+        start_date=START_DATE,
+        end_date=END_DATE,
+        batch_size=5000,
+        filter_mode="all",
+        progress_callback=lambda page, count: print(f"  Page {page}: {count} rows so far..."),
+    )
+    write = write_parquet if args.format == "parquet" else write_csv
+    total = write(prefetch(batches), output)
+
+    print(f"\nDone! {total} assets written to {output}")
 
 
 if __name__ == "__main__":